@@ -3,20 +3,15 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from job_alert.auth.kakao_session_bootstrap import bootstrap_kakao_session, encode_storage_state_b64
-from job_alert.config import (
-    RUN_REQUIRED_ENVS,
-    assert_required_envs,
-    ensure_hojubada_storage_state,
-    load_settings,
-    missing_envs,
-)
-from job_alert.pipeline import run_pipeline
-from job_alert.storage import StateStore
+from job_alert import __version__
+
+# Keep this module import-light: `--help`, `--version` and argparse errors must not pay for
+# httpx/lxml/playwright or the scrapers. Command handlers import what they need.
 
 
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="job-alert")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     subparsers.add_parser("run", help="Run scraping + filtering + Slack notification pipeline")
@@ -44,6 +39,9 @@ def _build_parser() -> argparse.ArgumentParser:
 
 
 def _cmd_run() -> int:
+    from job_alert.config import RUN_REQUIRED_ENVS, assert_required_envs, load_settings
+    from job_alert.pipeline import run_pipeline
+
     settings = load_settings()
     assert_required_envs(RUN_REQUIRED_ENVS)
     result = run_pipeline(settings)
@@ -63,6 +61,14 @@ def _cmd_run() -> int:
 
 
 def _cmd_healthcheck() -> int:
+    from job_alert.config import (
+        RUN_REQUIRED_ENVS,
+        ensure_hojubada_storage_state,
+        load_settings,
+        missing_envs,
+    )
+    from job_alert.storage import StateStore
+
     settings = load_settings()
     missing = missing_envs(RUN_REQUIRED_ENVS)
     if missing:
@@ -91,6 +97,12 @@ def _cmd_healthcheck() -> int:
 
 
 def _cmd_bootstrap(args: argparse.Namespace) -> int:
+    from job_alert.auth.kakao_session_bootstrap import (
+        bootstrap_kakao_session,
+        encode_storage_state_b64,
+    )
+    from job_alert.config import load_settings
+
     settings = load_settings()
     output_path = args.output or settings.hojubada_storage_path
     headed = not args.headless if args.headless else args.headed
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import base64
+import binascii
 import os
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Mapping, Sequence
-
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import Any
 
 MODULE_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_SENT_DB_PATH = MODULE_ROOT / "data" / "sent_posts.sqlite"
@@ -20,9 +21,36 @@ RUN_REQUIRED_ENVS = (
     "HOJUBADA_ID",
     "HOJUBADA_PW",
 )
+# (Settings field, env var, caster, default used when the env var is empty or unset)
+_ENV_SCHEMA: tuple[tuple[str, str, Callable[[str], Any], Any], ...] = (
+    ("slack_webhook_url", "SLACK_WEBHOOK_URL", str, ""),
+    ("woorimel_id", "WOORIMEL_ID", str, ""),
+    ("woorimel_pw", "WOORIMEL_PW", str, ""),
+    ("melbsky_id", "MELBSKY_ID", str, ""),
+    ("melbsky_pw", "MELBSKY_PW", str, ""),
+    ("hojubada_id", "HOJUBADA_ID", str, ""),
+    ("hojubada_pw", "HOJUBADA_PW", str, ""),
+    ("hojubada_storage_state_b64", "HOJUBADA_STORAGE_STATE_B64", str, ""),
+    ("keywords_csv", "KEYWORDS_CSV", str, None),
+    ("keyword_blacklist_csv", "KEYWORD_BLACKLIST_CSV", str, None),
+    ("tz", "TZ", str, "Australia/Melbourne"),
+    ("request_timeout_seconds", "REQUEST_TIMEOUT_SECONDS", float, 20.0),
+    ("user_agent", "USER_AGENT", str, "job-alert-bot/0.1"),
+    ("site_retry_attempts", "SITE_RETRY_ATTEMPTS", int, 2),
+    ("site_retry_delay_seconds", "SITE_RETRY_DELAY_SECONDS", float, 1.0),
+    ("error_alert_threshold", "ERROR_ALERT_THRESHOLD", int, 2),
+    ("sent_db_path", "SENT_DB_PATH", Path, DEFAULT_SENT_DB_PATH),
+    ("hojubada_storage_path", "HOJUBADA_STORAGE_PATH", Path, DEFAULT_HOJUBADA_STATE_PATH),
+)
+SETTINGS_ENVS = tuple(env for _, env, _, _ in _ENV_SCHEMA)
+# Base64 characters decoded per write; a multiple of 4 so chunks never split a quantum.
+_B64_DECODE_CHUNK_CHARS = 64 * 1024
 
+EnvSnapshot = tuple[tuple[str, str], ...]
 
-class Settings(BaseModel):
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     slack_webhook_url: str = ""
     woorimel_id: str = ""
     woorimel_pw: str = ""
@@ -36,57 +64,51 @@ class Settings(BaseModel):
     tz: str = "Australia/Melbourne"
     request_timeout_seconds: float = 20.0
     user_agent: str = "job-alert-bot/0.1"
-    site_retry_attempts: int = Field(default=2, ge=1)
-    site_retry_delay_seconds: float = Field(default=1.0, ge=0.0)
-    error_alert_threshold: int = Field(default=2, ge=1)
-    sent_db_path: Path = Field(default=DEFAULT_SENT_DB_PATH)
-    hojubada_storage_path: Path = Field(default=DEFAULT_HOJUBADA_STATE_PATH)
+    site_retry_attempts: int = 2
+    site_retry_delay_seconds: float = 1.0
+    error_alert_threshold: int = 2
+    sent_db_path: Path = DEFAULT_SENT_DB_PATH
+    hojubada_storage_path: Path = DEFAULT_HOJUBADA_STATE_PATH
+
+    def __post_init__(self) -> None:
+        _validate(self)
 
-    @field_validator("slack_webhook_url")
-    @classmethod
-    def _validate_webhook_url(cls, value: str) -> str:
-        if value and not value.startswith("https://"):
-            raise ValueError("SLACK_WEBHOOK_URL must use https://")
-        return value
+
+def _validate(settings: Settings) -> None:
+    if settings.slack_webhook_url and not settings.slack_webhook_url.startswith("https://"):
+        raise ValueError("SLACK_WEBHOOK_URL must use https://")
+    if settings.site_retry_attempts < 1:
+        raise ValueError("SITE_RETRY_ATTEMPTS must be >= 1")
+    if settings.site_retry_delay_seconds < 0:
+        raise ValueError("SITE_RETRY_DELAY_SECONDS must be >= 0")
+    if settings.error_alert_threshold < 1:
+        raise ValueError("ERROR_ALERT_THRESHOLD must be >= 1")
 
 
 def _env_value(environ: Mapping[str, str], key: str) -> str:
     return environ.get(key, "").strip()
 
 
-def missing_envs(required: Sequence[str], environ: Mapping[str, str] | None = None) -> list[str]:
+def _env_snapshot(keys: Sequence[str], environ: Mapping[str, str] | None = None) -> EnvSnapshot:
     source = os.environ if environ is None else environ
-    return [key for key in required if not _env_value(source, key)]
+    return tuple((key, _env_value(source, key)) for key in keys)
+
+
+def missing_envs(required: Sequence[str], environ: Mapping[str, str] | None = None) -> list[str]:
+    return [key for key, value in _env_snapshot(required, environ) if not value]
 
 
 def load_settings(environ: Mapping[str, str] | None = None) -> Settings:
-    source = os.environ if environ is None else environ
+    return _load_settings_cached(_env_snapshot(SETTINGS_ENVS, environ))
+
+
+@lru_cache(maxsize=8)
+def _load_settings_cached(snapshot: EnvSnapshot) -> Settings:
     payload = {
-        "slack_webhook_url": _env_value(source, "SLACK_WEBHOOK_URL"),
-        "woorimel_id": _env_value(source, "WOORIMEL_ID"),
-        "woorimel_pw": _env_value(source, "WOORIMEL_PW"),
-        "melbsky_id": _env_value(source, "MELBSKY_ID"),
-        "melbsky_pw": _env_value(source, "MELBSKY_PW"),
-        "hojubada_id": _env_value(source, "HOJUBADA_ID"),
-        "hojubada_pw": _env_value(source, "HOJUBADA_PW"),
-        "hojubada_storage_state_b64": _env_value(source, "HOJUBADA_STORAGE_STATE_B64"),
-        "keywords_csv": _env_value(source, "KEYWORDS_CSV") or None,
-        "keyword_blacklist_csv": _env_value(source, "KEYWORD_BLACKLIST_CSV") or None,
-        "tz": _env_value(source, "TZ") or "Australia/Melbourne",
-        "request_timeout_seconds": float(_env_value(source, "REQUEST_TIMEOUT_SECONDS") or "20"),
-        "user_agent": _env_value(source, "USER_AGENT") or "job-alert-bot/0.1",
-        "site_retry_attempts": int(_env_value(source, "SITE_RETRY_ATTEMPTS") or "2"),
-        "site_retry_delay_seconds": float(_env_value(source, "SITE_RETRY_DELAY_SECONDS") or "1"),
-        "error_alert_threshold": int(_env_value(source, "ERROR_ALERT_THRESHOLD") or "2"),
-        "sent_db_path": Path(_env_value(source, "SENT_DB_PATH") or DEFAULT_SENT_DB_PATH),
-        "hojubada_storage_path": Path(
-            _env_value(source, "HOJUBADA_STORAGE_PATH") or DEFAULT_HOJUBADA_STATE_PATH
-        ),
+        field: caster(value) if value else default
+        for (field, _, caster, default), (_, value) in zip(_ENV_SCHEMA, snapshot, strict=True)
     }
-    try:
-        return Settings(**payload)
-    except ValidationError as exc:
-        raise ValueError(str(exc)) from exc
+    return Settings(**payload)
 
 
 def assert_required_envs(required: Sequence[str], environ: Mapping[str, str] | None = None) -> None:
@@ -96,12 +118,24 @@ def assert_required_envs(required: Sequence[str], environ: Mapping[str, str] | N
         raise ValueError(f"Missing required environment variables: {keys}")
 
 
+def _write_b64_decoded(encoded: str, path: Path) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        with tmp_path.open("wb") as fh:
+            for start in range(0, len(encoded), _B64_DECODE_CHUNK_CHARS):
+                chunk = encoded[start : start + _B64_DECODE_CHUNK_CHARS]
+                fh.write(binascii.a2b_base64(chunk, strict_mode=True))
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
+
+
 def ensure_hojubada_storage_state(settings: Settings) -> Path | None:
     encoded = settings.hojubada_storage_state_b64.strip()
     if encoded:
-        decoded = base64.b64decode(encoded, validate=True)
         settings.hojubada_storage_path.parent.mkdir(parents=True, exist_ok=True)
-        settings.hojubada_storage_path.write_bytes(decoded)
+        _write_b64_decoded(encoded, settings.hojubada_storage_path)
         return settings.hojubada_storage_path
     if settings.hojubada_storage_path.exists():
         return settings.hojubada_storage_path
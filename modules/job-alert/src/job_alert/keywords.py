@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
 
 DEFAULT_KEYWORDS = (
     "건설",
@@ -31,12 +33,27 @@ DEFAULT_BLACKLIST_KEYWORDS = (
     "kitchen hand",
 )
 
+_NEVER_MATCH_RE = re.compile(r"(?!)")
+
+
+class _NonAlnumToSpace(dict[int, int | str]):
+    """str.translate table mapping every non-alphanumeric code point to a space.
+
+    Filled lazily so only code points that actually occur are classified.
+    """
+
+    def __missing__(self, codepoint: int) -> int | str:
+        value: int | str = codepoint if chr(codepoint).isalnum() else " "
+        self[codepoint] = value
+        return value
+
+
+_NON_ALNUM_TO_SPACE = _NonAlnumToSpace()
+
 
 def normalize_text(value: str) -> str:
     normalized = unicodedata.normalize("NFKC", value or "").casefold()
-    normalized = re.sub(r"[\W_]+", " ", normalized)
-    normalized = re.sub(r"\s+", " ", normalized).strip()
-    return normalized
+    return " ".join(normalized.translate(_NON_ALNUM_TO_SPACE).split())
 
 
 def parse_keywords_csv(value: str | None) -> list[str]:
@@ -45,23 +62,52 @@ def parse_keywords_csv(value: str | None) -> list[str]:
     return [item.strip() for item in value.split(",") if item.strip()]
 
 
-def build_keyword_set(extra_csv: str | None = None) -> list[str]:
-    combined = list(DEFAULT_KEYWORDS) + parse_keywords_csv(extra_csv)
-    normalized = {normalize_text(word) for word in combined if normalize_text(word)}
-    return sorted(normalized)
+def _normalize_all(words: Iterable[str]) -> set[str]:
+    return {normalized for normalized in map(normalize_text, words) if normalized}
+
+
+def _longest_first(term: str) -> tuple[int, str]:
+    return (-len(term), term)
+
+
+_NORMALIZED_DEFAULT_KEYWORDS = frozenset(_normalize_all(DEFAULT_KEYWORDS))
+_NORMALIZED_DEFAULT_BLACKLIST = frozenset(_normalize_all(DEFAULT_BLACKLIST_KEYWORDS))
+
+
+@lru_cache(maxsize=8)
+def build_keyword_set(extra_csv: str | None = None) -> tuple[str, ...]:
+    normalized = _NORMALIZED_DEFAULT_KEYWORDS | _normalize_all(parse_keywords_csv(extra_csv))
+    return tuple(sorted(normalized, key=_longest_first))
+
+
+@lru_cache(maxsize=8)
+def build_blacklist_set(extra_csv: str | None = None) -> tuple[str, ...]:
+    normalized = _NORMALIZED_DEFAULT_BLACKLIST | _normalize_all(parse_keywords_csv(extra_csv))
+    return tuple(sorted(normalized, key=_longest_first))
+
+
+def compile_keyword_pattern(keywords: Iterable[str]) -> re.Pattern[str]:
+    """Compile normalized keywords into one alternation so a haystack is scanned once."""
+    terms = sorted(set(keywords), key=_longest_first)
+    if not terms:
+        return _NEVER_MATCH_RE
+    return re.compile("|".join(re.escape(term) for term in terms))
+
+
+def post_haystack(title: str, snippet: str) -> str:
+    return normalize_text(f"{title} {snippet}")
 
 
-def build_blacklist_set(extra_csv: str | None = None) -> list[str]:
-    combined = list(DEFAULT_BLACKLIST_KEYWORDS) + parse_keywords_csv(extra_csv)
-    normalized = {normalize_text(word) for word in combined if normalize_text(word)}
-    return sorted(normalized)
+def matches_normalized(haystack: str, terms: Sequence[str] | re.Pattern[str]) -> bool:
+    """Match against text that has already been through normalize_text."""
+    if isinstance(terms, re.Pattern):
+        return terms.search(haystack) is not None
+    return any(term in haystack for term in terms)
 
 
-def matches_keywords(title: str, snippet: str, keywords: list[str]) -> bool:
-    haystack = normalize_text(f"{title} {snippet}")
-    return any(keyword in haystack for keyword in keywords)
+def matches_keywords(title: str, snippet: str, keywords: Sequence[str] | re.Pattern[str]) -> bool:
+    return matches_normalized(post_haystack(title, snippet), keywords)
 
 
-def matches_blacklist(title: str, snippet: str, blacklist: list[str]) -> bool:
-    haystack = normalize_text(f"{title} {snippet}")
-    return any(term in haystack for term in blacklist)
+def matches_blacklist(title: str, snippet: str, blacklist: Sequence[str] | re.Pattern[str]) -> bool:
+    return matches_normalized(post_haystack(title, snippet), blacklist)
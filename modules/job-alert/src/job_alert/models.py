@@ -19,6 +19,9 @@ class SiteResult:
     source: str
     posts: list[JobPost]
     error: str | None = None
+    # False when the error cannot clear on its own (missing dependency, login form changed,
+    # rejected credentials); the pipeline then skips the remaining retry attempts.
+    retryable: bool = True
 
 
 @dataclass(frozen=True)
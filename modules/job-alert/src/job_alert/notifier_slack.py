@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import httpx
-
 
 def send_slack_message(webhook_url: str, message_text: str, timeout_seconds: float = 20.0) -> None:
+    import httpx
+
     response = httpx.post(
         webhook_url,
         json={"text": message_text},
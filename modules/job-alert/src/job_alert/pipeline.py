@@ -1,35 +1,51 @@
 from __future__ import annotations
 
+import functools
+import importlib
+import inspect
+import itertools
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime, timezone
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 from job_alert.config import Settings, ensure_hojubada_storage_state
 from job_alert.keywords import (
     build_blacklist_set,
     build_keyword_set,
-    matches_blacklist,
-    matches_keywords,
+    compile_keyword_pattern,
+    matches_normalized,
+    post_haystack,
 )
 from job_alert.models import JobPost, PipelineResult, SiteResult
 from job_alert.notifier_slack import send_slack_message
-from job_alert.scrapers.hojubada import fetch_hojubada_posts
-from job_alert.scrapers.melbsky import fetch_melbsky_posts
-from job_alert.scrapers.woorimel import fetch_woorimel_posts
+from job_alert.scrapers.browser import PlaywrightSession
 from job_alert.storage import StateStore
 
-Scraper = Callable[[Settings], SiteResult]
+# Scrapers take Settings and may declare optional keyword-only resources that the pipeline
+# injects (see _bind_resources): `client` (shared httpx.Client), `html_cache` (per-run parsed
+# pages) and `browser_session`.
+Scraper = Callable[..., SiteResult]
 Sender = Callable[[str, str, float], None]
 
-DEFAULT_SCRAPERS: tuple[Scraper, ...] = (
-    fetch_woorimel_posts,
-    fetch_melbsky_posts,
-    fetch_hojubada_posts,
+# Scrapers are referenced as "module:function" and imported only when a run needs them, so
+# importing this module does not pull in httpx/lxml/playwright.
+DEFAULT_SCRAPER_PATHS: tuple[str, ...] = (
+    "job_alert.scrapers.woorimel:fetch_woorimel_posts",
+    "job_alert.scrapers.melbsky:fetch_melbsky_posts",
+    "job_alert.scrapers.hojubada:fetch_hojubada_posts",
 )
 SITE_FAILURE_STREAK_META_PREFIX = "site_failure_streak:"
 
 
+def _resolve(path: str) -> Scraper:
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
 def _scraper_name(scraper: Scraper) -> str:
     name = getattr(scraper, "__name__", "unknown")
     if name.startswith("fetch_") and name.endswith("_posts"):
@@ -44,23 +60,85 @@ def _safe_run_scraper(scraper: Scraper, settings: Settings) -> SiteResult:
         return SiteResult(source=_scraper_name(scraper), posts=[], error=f"unexpected error: {exc}")
 
 
+def _accepts(scraper: Scraper, parameter: str) -> bool:
+    try:
+        return parameter in inspect.signature(scraper).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _open_shared_resources(
+    scrapers: tuple[Scraper, ...], settings: Settings, stack: ExitStack
+) -> dict[str, object]:
+    shared: dict[str, object] = {}
+    if any(_accepts(scraper, "client") for scraper in scrapers):
+        from job_alert.scrapers.common import http_client
+
+        # One pooled client for every HTTP scraper so connections are reused across sites.
+        shared["client"] = stack.enter_context(http_client(settings))
+    if any(_accepts(scraper, "html_cache") for scraper in scrapers):
+        # Successful page bodies, kept for the run so retries skip pages already fetched.
+        shared["html_cache"] = {}
+    return shared
+
+
+def _bind_resources(scraper: Scraper, stack: ExitStack, shared: Mapping[str, object]) -> Scraper:
+    resources = {name: value for name, value in shared.items() if _accepts(scraper, name)}
+    if _accepts(scraper, "browser_session"):
+        # Created on the worker thread and shared by every retry of this scraper.
+        resources["browser_session"] = stack.enter_context(PlaywrightSession())
+    if not resources:
+        return scraper
+    return functools.update_wrapper(functools.partial(scraper, **resources), scraper)
+
+
 def _run_scraper_with_retry(
     scraper: Scraper,
     settings: Settings,
     *,
     attempts: int,
     delay_seconds: float,
+    shared_resources: Mapping[str, object],
+) -> SiteResult:
+    result: SiteResult | None = None
+    try:
+        with ExitStack() as stack:
+            result = _retry_scraper(
+                _bind_resources(scraper, stack, shared_resources),
+                settings,
+                attempts=attempts,
+                delay_seconds=delay_seconds,
+            )
+    except Exception as exc:  # pragma: no cover - resource setup/teardown boundary
+        if result is None:
+            result = SiteResult(
+                source=_scraper_name(scraper), posts=[], error=f"unexpected error: {exc}"
+            )
+    return result
+
+
+def _retry_scraper(
+    scraper: Scraper,
+    settings: Settings,
+    *,
+    attempts: int,
+    delay_seconds: float,
 ) -> SiteResult:
     last_result: SiteResult | None = None
     for attempt in range(attempts):
         last_result = _safe_run_scraper(scraper, settings)
-        if not last_result.error:
+        if not last_result.error or not last_result.retryable:
             return last_result
         if attempt < attempts - 1 and delay_seconds > 0:
             time.sleep(delay_seconds)
     return last_result or SiteResult(source=_scraper_name(scraper), posts=[], error="unknown error")
 
 
+@lru_cache(maxsize=4)
+def _tz(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
 def _build_summary_message(
     settings: Settings,
     run_at_utc: datetime,
@@ -71,7 +149,7 @@ def _build_summary_message(
     transient_failures: list[str],
 ) -> str:
     try:
-        local_now = run_at_utc.astimezone(ZoneInfo(settings.tz))
+        local_now = run_at_utc.astimezone(_tz(settings.tz))
     except Exception:
         local_now = run_at_utc
 
@@ -124,21 +202,23 @@ def _parse_int_or_zero(raw: str | None) -> int:
 def _update_failure_streaks(store: StateStore, site_results: list[SiteResult]) -> dict[str, int]:
     streaks: dict[str, int] = {}
     for result in site_results:
-        key = _site_failure_streak_key(result.source)
-        previous = _parse_int_or_zero(store.get_meta(key))
-        current = previous + 1 if result.error else 0
-        store.set_meta(key, str(current))
-        streaks[result.source] = current
+        previous = _parse_int_or_zero(store.get_meta(_site_failure_streak_key(result.source)))
+        streaks[result.source] = previous + 1 if result.error else 0
+    store.set_meta_many(
+        (_site_failure_streak_key(source), str(current)) for source, current in streaks.items()
+    )
     return streaks
 
 
 def run_pipeline(
     settings: Settings,
     *,
-    scrapers: tuple[Scraper, ...] = DEFAULT_SCRAPERS,
+    scrapers: tuple[Scraper, ...] | None = None,
     send_message: Sender = send_slack_message,
     now_utc: datetime | None = None,
 ) -> PipelineResult:
+    if scrapers is None:
+        scrapers = tuple(_resolve(path) for path in DEFAULT_SCRAPER_PATHS)
     run_at_utc = now_utc or datetime.now(timezone.utc)
     run_at_iso = run_at_utc.replace(microsecond=0).isoformat()
 
@@ -148,36 +228,49 @@ def run_pipeline(
         # Invalid/missing base64 state is non-fatal; scraper will attempt credential login.
         pass
 
-    site_results: list[SiteResult] = []
-    for scraper in scrapers:
-        site_results.append(
-            _run_scraper_with_retry(
+    # Scrapers are network-bound and independent, so run one worker per site. Results are
+    # collected in submission order to keep summaries and error lists deterministic.
+    with (
+        ExitStack() as resource_stack,
+        ThreadPoolExecutor(max_workers=len(scrapers) or 1) as executor,
+    ):
+        shared_resources = _open_shared_resources(scrapers, settings, resource_stack)
+        futures = [
+            executor.submit(
+                _run_scraper_with_retry,
                 scraper,
                 settings,
                 attempts=settings.site_retry_attempts,
                 delay_seconds=settings.site_retry_delay_seconds,
+                shared_resources=shared_resources,
             )
-        )
+            for scraper in scrapers
+        ]
+        site_results = [future.result() for future in futures]
 
-    all_posts = [post for result in site_results for post in result.posts]
-    keyword_set = build_keyword_set(settings.keywords_csv)
-    blacklist_set = build_blacklist_set(settings.keyword_blacklist_csv)
+    total_collected = sum(len(result.posts) for result in site_results)
+    all_posts = itertools.chain.from_iterable(result.posts for result in site_results)
+    keyword_pattern = compile_keyword_pattern(build_keyword_set(settings.keywords_csv))
+    blacklist_pattern = compile_keyword_pattern(build_blacklist_set(settings.keyword_blacklist_csv))
 
-    keyword_matched_posts = [
-        post for post in all_posts if matches_keywords(post.title, post.content_snippet, keyword_set)
-    ]
+    normalized_posts = (
+        (post, post_haystack(post.title, post.content_snippet)) for post in all_posts
+    )
     keyword_matched_posts = [
         post
-        for post in keyword_matched_posts
-        if not matches_blacklist(post.title, post.content_snippet, blacklist_set)
+        for post, haystack in normalized_posts
+        if matches_normalized(haystack, keyword_pattern)
+        and not matches_normalized(haystack, blacklist_pattern)
     ]
 
     error_messages = [f"{result.source}: {result.error}" for result in site_results if result.error]
     success_site_count = sum(1 for result in site_results if not result.error)
     failed_site_count = len(site_results) - success_site_count
 
-    with StateStore(settings.sent_db_path) as store:
-        unsent_posts = store.get_unsent_posts(keyword_matched_posts)
+    # One transaction for the whole run: a single commit instead of one per write. New posts
+    # are recorded before sending; a failed send rolls them back so they are retried next run.
+    with StateStore(settings.sent_db_path) as store, store.transaction():
+        unsent_posts = store.insert_new_and_return(keyword_matched_posts, run_at_iso)
         failure_streaks = _update_failure_streaks(store, site_results)
 
         notified_error_messages: list[str] = []
@@ -214,13 +307,11 @@ def run_pipeline(
                 summary_text,
                 settings.request_timeout_seconds,
             )
-            if unsent_posts:
-                store.mark_posts_sent(unsent_posts, sent_at_utc=run_at_iso)
 
         store.log_run(run_at_iso, new_count=len(unsent_posts), error_count=len(error_messages))
 
     return PipelineResult(
-        total_collected=len(all_posts),
+        total_collected=total_collected,
         keyword_matched=len(keyword_matched_posts),
         new_count=len(unsent_posts),
         success_site_count=success_site_count,
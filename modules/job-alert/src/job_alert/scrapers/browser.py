@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from contextlib import AbstractContextManager, suppress
+from typing import Any
+
+
+class PlaywrightSession(AbstractContextManager["PlaywrightSession"]):
+    """Chromium launched on first use and reused until the session closes.
+
+    Playwright's sync API is bound to the thread that started it, so create and use a
+    session on a single thread.
+    """
+
+    def __init__(self, *, headless: bool = True) -> None:
+        self.headless = headless
+        self._playwright: Any = None
+        self._browser: Any = None
+
+    @property
+    def browser(self) -> Any:
+        if self._browser is not None and not self._browser.is_connected():
+            # Chromium crashed or disconnected during an earlier attempt; relaunch so the retry
+            # does not run against a dead browser. Closing it may fail for the same reason.
+            with suppress(Exception):
+                self.close()
+        if self._browser is None:
+            from playwright.sync_api import sync_playwright
+
+            playwright = sync_playwright().start()
+            try:
+                browser = playwright.chromium.launch(headless=self.headless)
+            except BaseException:
+                # Stop the driver now: a retry would otherwise start a second one on this thread.
+                playwright.stop()
+                raise
+            self._playwright, self._browser = playwright, browser
+        return self._browser
+
+    def close(self) -> None:
+        browser, playwright = self._browser, self._playwright
+        self._browser = self._playwright = None
+        try:
+            if browser is not None:
+                browser.close()
+        finally:
+            if playwright is not None:
+                playwright.stop()
+
+    def __exit__(self, exc_type, exc, exc_tb) -> None:
+        self.close()
@@ -3,28 +3,112 @@ from __future__ import annotations
 import hashlib
 import re
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 from urllib.parse import parse_qs, urljoin, urlparse
 
-from bs4 import BeautifulSoup
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
 
+from job_alert.config import Settings
 from job_alert.models import JobPost
 
+if TYPE_CHECKING:
+    import httpx
+    from lxml.html import HtmlElement
+
 _POST_QUERY_KEYS = ("wr_id", "document_srl", "no", "idx", "article_no", "uid")
-_NAV_LINK_TEXTS = {
-    "login",
-    "logout",
-    "register",
-    "회원가입",
-    "로그인",
-    "공지",
-    "목록",
-    "이전",
-    "다음",
-}
+_POST_QUERY_KEY_SET = frozenset(_POST_QUERY_KEYS)
+_NAV_LINK_TEXTS = frozenset(
+    {
+        "login",
+        "logout",
+        "register",
+        "회원가입",
+        "로그인",
+        "공지",
+        "목록",
+        "이전",
+        "다음",
+    }
+)
+_SNIPPET_CONTAINER_TAGS = frozenset({"tr", "li", "div", "article"})
+_NON_TEXT_TAGS = ("script", "style", "template")
+_WS_RE = re.compile(r"\s+")
+_PATH_NUM_RE = re.compile(r"/(\d{3,})(?:/)?$")
+# Response characters handed to the incremental HTML parser per feed() call.
+_STREAM_CHUNK_CHARS = 64 * 1024
+
+
+def http_client(settings: Settings) -> httpx.Client:
+    """Pooled HTTP/2 client meant to be shared by every HTTP scraper in a run."""
+    import httpx
+
+    return httpx.Client(
+        timeout=settings.request_timeout_seconds,
+        headers={"User-Agent": settings.user_agent},
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    )
+
+
+def _is_transient_fetch_error(exc: BaseException) -> bool:
+    # Connection/timeout errors and throttled or 5xx responses may pass; a 404 will not.
+    import httpx
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.2, max=2) + wait_random(0, 0.2),
+    retry=retry_if_exception(_is_transient_fetch_error),
+    reraise=True,
+)
+def _fetch_document(client: httpx.Client, url: str) -> HtmlElement:
+    from lxml import html as lxml_html
+
+    # Parse while the body downloads instead of buffering it into one str first. httpx decodes
+    # the chunks: response.encoding tolerates charset labels libxml2 rejects (ks_c_5601-1987)
+    # and falls back to UTF-8 for unknown ones, as response.text did.
+    parser = lxml_html.HTMLParser()
+    with client.stream("GET", url) as response:
+        response.raise_for_status()
+        fed = False
+        for chunk in response.iter_text(_STREAM_CHUNK_CHARS):
+            parser.feed(chunk)
+            fed = True
+    root = parser.close() if fed else None
+    if root is None:  # empty or whitespace-only body
+        root = lxml_html.Element("html")
+    return _strip_non_text(root)
+
+
+def fetch_document(
+    client: httpx.Client, url: str, cache: dict[str, HtmlElement] | None = None
+) -> HtmlElement:
+    """GET and parse a page, reusing a document already fetched into `cache` during this run.
+
+    Only successful responses are cached, so a failed URL is fetched again on retry.
+    """
+    if cache is None:
+        return _fetch_document(client, url)
+    document = cache.get(url)
+    if document is None:
+        document = cache.setdefault(url, _fetch_document(client, url))
+    return document
 
 
 def _clean_spaces(value: str) -> str:
-    return re.sub(r"\s+", " ", value).strip()
+    return _WS_RE.sub(" ", value).strip()
 
 
 def infer_post_id(url: str) -> str:
@@ -35,7 +119,7 @@ def infer_post_id(url: str) -> str:
         if values and values[0].strip():
             return f"{key}:{values[0].strip()}"
 
-    path_match = re.search(r"/(\d{3,})(?:/)?$", parsed.path)
+    path_match = _PATH_NUM_RE.search(parsed.path)
     if path_match:
         return f"path:{path_match.group(1)}"
 
@@ -43,47 +127,95 @@ def infer_post_id(url: str) -> str:
     return f"hash:{digest}"
 
 
+@lru_cache(maxsize=16)
+def compile_url_tokens(tokens: tuple[str, ...]) -> re.Pattern[str]:
+    """One alternation over URL substrings, so each link is scanned once for all tokens."""
+    return re.compile("|".join(re.escape(token) for token in tokens))
+
+
 def _is_probable_index_link(url: str) -> bool:
     parsed = urlparse(url)
     query = parse_qs(parsed.query)
-    if any(key in query for key in _POST_QUERY_KEYS):
+    if not _POST_QUERY_KEY_SET.isdisjoint(query):
         return False
     if "page" in query or "findex" in query:
         return True
     return parsed.path.endswith("/")
 
 
-def _extract_snippet(anchor) -> str:
-    container = anchor.find_parent(["tr", "li", "div", "article"])
+def _element_text(element) -> str:
+    # Stripped text nodes joined by single spaces, like BeautifulSoup's get_text(" ", strip=True).
+    # Comments are skipped by itertext; scripts/styles are stripped in _parse_html.
+    return " ".join(piece.strip() for piece in element.itertext() if piece.strip())
+
+
+def _extract_snippet(anchor, container_texts: dict[Any, str]) -> str:
+    container = anchor.getparent()
+    while container is not None and container.tag not in _SNIPPET_CONTAINER_TAGS:
+        container = container.getparent()
     if container is None:
         return ""
-    text = _clean_spaces(container.get_text(" ", strip=True))
-    return text[:200]
+    # Several anchors often share one row/container; render its text only once. Keying on the
+    # element (not id()) keeps the lxml proxy alive, so the same node maps to the same key.
+    text = container_texts.get(container)
+    if text is None:
+        text = _clean_spaces(_element_text(container))[:200]
+        container_texts[container] = text
+    return text
+
+
+def _strip_non_text(root: HtmlElement) -> HtmlElement:
+    from lxml import etree
+
+    etree.strip_elements(root, *_NON_TEXT_TAGS, with_tail=False)
+    return root
+
+
+def _parse_html(html: str) -> HtmlElement:
+    from lxml import html as lxml_html
+
+    # Parse from UTF-8 bytes so documents carrying an XML encoding declaration are accepted.
+    parser = lxml_html.HTMLParser(encoding="utf-8")
+    return _strip_non_text(lxml_html.document_fromstring(html.encode("utf-8"), parser=parser))
 
 
 def parse_board_posts(
-    html: str,
+    html: str | HtmlElement,
     *,
     base_url: str,
     source: str,
-    allow_url_tokens: tuple[str, ...],
+    allow_url_tokens: tuple[str, ...] | re.Pattern[str],
     limit: int = 80,
 ) -> list[JobPost]:
-    soup = BeautifulSoup(html, "html.parser")
-    fetched_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    """Extract posts from board HTML, given as text or as a document from fetch_document."""
+    if isinstance(html, str):
+        if not html.strip():
+            return []
+        root = _parse_html(html)
+    else:
+        root = html
+    fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    if isinstance(allow_url_tokens, re.Pattern):
+        allow_url_re: re.Pattern[str] | None = allow_url_tokens
+    else:
+        allow_url_re = compile_url_tokens(allow_url_tokens) if allow_url_tokens else None
     posts: list[JobPost] = []
     seen_keys: set[tuple[str, str]] = set()
     seen_urls: set[str] = set()
+    container_texts: dict[Any, str] = {}
 
-    for anchor in soup.select("a[href]"):
-        raw_title = _clean_spaces(anchor.get_text(" ", strip=True))
+    for anchor in root.iter("a"):
+        raw_href = anchor.get("href")
+        if raw_href is None:
+            continue
+        raw_title = _clean_spaces(_element_text(anchor))
         if len(raw_title) < 2 or raw_title.casefold() in _NAV_LINK_TEXTS:
             continue
 
-        href = urljoin(base_url, anchor.get("href", ""))
+        href = urljoin(base_url, raw_href)
         if not href.startswith(("http://", "https://")):
             continue
-        if allow_url_tokens and not any(token in href for token in allow_url_tokens):
+        if allow_url_re is not None and allow_url_re.search(href) is None:
             continue
         if _is_probable_index_link(href):
             continue
@@ -95,7 +227,7 @@ def parse_board_posts(
         if key in seen_keys:
             continue
 
-        snippet = _extract_snippet(anchor)
+        snippet = _extract_snippet(anchor, container_texts)
         if snippet == raw_title:
             snippet = ""
 
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from job_alert.config import Settings
-from job_alert.models import SiteResult
-from job_alert.scrapers.common import dedupe_posts, parse_board_posts
+from job_alert.models import JobPost, SiteResult
+from job_alert.scrapers.browser import PlaywrightSession
+from job_alert.scrapers.common import compile_url_tokens, dedupe_posts, parse_board_posts
 
 SOURCE_NAME = "hojubada"
 BOARD_URL = "http://hojubada.com/bbs/board.php?bo_table=genguin"
 LOGIN_URL = "http://hojubada.com/bbs/login.php"
+_ALLOW_URL_RE = compile_url_tokens(("bo_table=genguin", "wr_id=", "board.php"))
 
 _KAKAO_LOGIN_TRIGGER_SELECTORS = (
     "a[href*='kakao']",
@@ -52,6 +54,15 @@ def _first_fill(page, selectors: tuple[str, ...], value: str, timeout_ms: int =
     return False
 
 
+def _parse_posts(html: str) -> list[JobPost]:
+    return parse_board_posts(
+        html,
+        base_url=BOARD_URL,
+        source=SOURCE_NAME,
+        allow_url_tokens=_ALLOW_URL_RE,
+    )
+
+
 def _needs_authentication(current_url: str, html: str, posts_count: int) -> bool:
     if posts_count > 0:
         return False
@@ -94,56 +105,59 @@ def _login_with_kakao(page, settings: Settings) -> str | None:
     return None
 
 
-def fetch_hojubada_posts(settings: Settings) -> SiteResult:
+def fetch_hojubada_posts(
+    settings: Settings, *, browser_session: PlaywrightSession | None = None
+) -> SiteResult:
+    if browser_session is None:
+        with PlaywrightSession() as session:
+            return fetch_hojubada_posts(settings, browser_session=session)
+
     context_kwargs = {"user_agent": settings.user_agent}
     if settings.hojubada_storage_path.exists():
         context_kwargs["storage_state"] = str(settings.hojubada_storage_path)
 
     try:
-        from playwright.sync_api import sync_playwright
-    except Exception as exc:  # pragma: no cover - import depends on env
-        return SiteResult(source=SOURCE_NAME, posts=[], error=f"playwright import failed: {exc}")
+        browser = browser_session.browser
+    except ImportError as exc:  # pragma: no cover - import depends on env
+        return SiteResult(
+            source=SOURCE_NAME,
+            posts=[],
+            error=f"playwright import failed: {exc}",
+            retryable=False,
+        )
+    except Exception as exc:  # pragma: no cover - depends on browser install
+        return SiteResult(source=SOURCE_NAME, posts=[], error=str(exc))
 
     html = ""
     current_url = ""
+    posts: list[JobPost] = []
     try:
-        with sync_playwright() as playwright:
-            browser = playwright.chromium.launch(headless=True)
-            context = browser.new_context(**context_kwargs)
+        context = browser.new_context(**context_kwargs)
+        try:
             page = context.new_page()
             page.goto(BOARD_URL, wait_until="domcontentloaded", timeout=45_000)
             page.wait_for_timeout(2_000)
             html = page.content()
             current_url = page.url
 
-            existing_posts = parse_board_posts(
-                html,
-                base_url=BOARD_URL,
-                source=SOURCE_NAME,
-                allow_url_tokens=("bo_table=genguin", "wr_id=", "board.php"),
-            )
-            if _needs_authentication(current_url, html, len(existing_posts)):
+            posts = _parse_posts(html)
+            if _needs_authentication(current_url, html, len(posts)):
                 login_error = _login_with_kakao(page, settings)
                 if login_error:
-                    context.close()
-                    browser.close()
-                    return SiteResult(source=SOURCE_NAME, posts=[], error=login_error)
+                    return SiteResult(
+                        source=SOURCE_NAME, posts=[], error=login_error, retryable=False
+                    )
                 html = page.content()
                 current_url = page.url
+                posts = _parse_posts(html)
 
             settings.hojubada_storage_path.parent.mkdir(parents=True, exist_ok=True)
             context.storage_state(path=str(settings.hojubada_storage_path))
+        finally:
             context.close()
-            browser.close()
     except Exception as exc:  # pragma: no cover - depends on network/browser
         return SiteResult(source=SOURCE_NAME, posts=[], error=str(exc))
 
-    posts = parse_board_posts(
-        html,
-        base_url=BOARD_URL,
-        source=SOURCE_NAME,
-        allow_url_tokens=("bo_table=genguin", "wr_id=", "board.php"),
-    )
     posts = dedupe_posts(posts)
 
     if _needs_authentication(current_url, html, len(posts)):
@@ -151,6 +165,7 @@ def fetch_hojubada_posts(settings: Settings) -> SiteResult:
             source=SOURCE_NAME,
             posts=[],
             error="authentication required; verify HOJUBADA_ID/HOJUBADA_PW",
+            retryable=False,
         )
 
     return SiteResult(source=SOURCE_NAME, posts=posts, error=None)
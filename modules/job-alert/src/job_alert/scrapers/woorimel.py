@@ -1,45 +1,65 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
 import httpx
-from tenacity import retry, stop_after_attempt, wait_fixed
 
 from job_alert.config import Settings
-from job_alert.models import SiteResult
-from job_alert.scrapers.common import dedupe_posts, parse_board_posts
+from job_alert.models import JobPost, SiteResult
+from job_alert.scrapers.common import (
+    compile_url_tokens,
+    dedupe_posts,
+    fetch_document,
+    http_client,
+    parse_board_posts,
+)
+
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
 
 SOURCE_NAME = "woorimel"
 BOARD_URLS = (
     "https://woorimel.com/board/melbourne-jobs",
     "https://woorimel.com/board/melbourne-jobs?category_id=&findex=post_datetime+desc&page=2",
 )
+_ALLOW_URL_RE = compile_url_tokens(("melbourne-jobs", "wr_id=", "document_srl="))
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_fixed(1), reraise=True)
-def _fetch_html(client: httpx.Client, url: str) -> str:
-    response = client.get(url)
-    response.raise_for_status()
-    return response.text
+def _fetch_board_posts(
+    client: httpx.Client, url: str, html_cache: dict[str, HtmlElement] | None
+) -> list[JobPost]:
+    return parse_board_posts(
+        fetch_document(client, url, html_cache),
+        base_url=url,
+        source=SOURCE_NAME,
+        allow_url_tokens=_ALLOW_URL_RE,
+    )
+
 
+def fetch_woorimel_posts(
+    settings: Settings,
+    *,
+    client: httpx.Client | None = None,
+    html_cache: dict[str, HtmlElement] | None = None,
+) -> SiteResult:
+    if client is None:
+        with http_client(settings) as own_client:
+            return fetch_woorimel_posts(settings, client=own_client, html_cache=html_cache)
 
-def fetch_woorimel_posts(settings: Settings) -> SiteResult:
     posts = []
     errors: list[str] = []
-    headers = {"User-Agent": settings.user_agent}
-
-    with httpx.Client(timeout=settings.request_timeout_seconds, headers=headers) as client:
-        for url in BOARD_URLS:
-            try:
-                html = _fetch_html(client, url)
-                posts.extend(
-                    parse_board_posts(
-                        html,
-                        base_url=url,
-                        source=SOURCE_NAME,
-                        allow_url_tokens=("melbourne-jobs", "wr_id=", "document_srl="),
-                    )
-                )
-            except Exception as exc:  # pragma: no cover - depends on network
-                errors.append(f"{url}: {exc}")
+    # httpx.Client is safe to share between threads; fetch every board page at once.
+    with ThreadPoolExecutor(max_workers=len(BOARD_URLS)) as executor:
+        futures = [
+            (url, executor.submit(_fetch_board_posts, client, url, html_cache))
+            for url in BOARD_URLS
+        ]
+    for url, future in futures:
+        try:
+            posts.extend(future.result())
+        except Exception as exc:  # pragma: no cover - depends on network
+            errors.append(f"{url}: {exc}")
 
     return SiteResult(
         source=SOURCE_NAME,
@@ -1,138 +1,439 @@
 from __future__ import annotations
 
 import sqlite3
-from contextlib import AbstractContextManager
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, suppress
 from datetime import datetime, timezone
+from functools import cache
 from pathlib import Path
+from typing import Any, Protocol
 
 from job_alert.models import JobPost
 
+# Rows per multi-row INSERT; 4 parameters each keeps us under SQLite's historical 999 limit.
+_MAX_INSERT_ROWS = 200
+# (source, source_post_id) pairs per lookup query, under the same limit.
+_MAX_LOOKUP_KEYS = 450
+# Rows bound per executemany() call in mark_posts_sent.
+_MARK_SENT_CHUNK_ROWS = 500
+# Recently checked or written (source, source_post_id) keys remembered by is_sent.
+_SENT_CACHE_MAX_KEYS = 4096
+# WITHOUT ROWID keeps rows in the primary-key b-tree, so key lookups need no second probe.
+# Sources are stored as small integer ids into `sources` instead of repeating the site name on
+# every row, which keeps the key b-tree pages dense.
+_SENT_POSTS_DDL = """
+CREATE TABLE {table} (
+    source_id INTEGER NOT NULL REFERENCES sources (id),
+    source_post_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    first_sent_at TEXT NOT NULL,
+    PRIMARY KEY (source_id, source_post_id)
+) WITHOUT ROWID
+"""
+# WAL with synchronous=NORMAL syncs once per checkpoint instead of on every commit. The WAL
+# is checkpointed into the main file when the last connection closes, so the committed
+# sqlite file stays self-contained.
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -65536;
+PRAGMA mmap_size = 268435456;
+PRAGMA busy_timeout = 5000;
+"""
+# sqlite3 caches prepared statements keyed by SQL text; module-level constants keep every call
+# on the same text, and the larger cache leaves room for the chunked VALUES variants below.
+_STATEMENT_CACHE_SIZE = 256
+_SQL_SELECT_SENT_POSTS_SCHEMA = (
+    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'sent_posts'"
+)
+_SQL_CREATE_SOURCES = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+)
+"""
+_SQL_MIGRATE_SOURCES = "INSERT OR IGNORE INTO sources (name) SELECT DISTINCT source FROM sent_posts"
+_SQL_MIGRATE_SENT_POSTS = """
+INSERT INTO sent_posts_v2 (source_id, source_post_id, url, first_sent_at)
+SELECT sources.id, sent_posts.source_post_id, sent_posts.url, sent_posts.first_sent_at
+FROM sent_posts JOIN sources ON sources.name = sent_posts.source
+"""
+_SQL_CREATE_RUN_LOGS = """
+CREATE TABLE IF NOT EXISTS run_logs (
+    run_at TEXT PRIMARY KEY,
+    new_count INTEGER NOT NULL,
+    error_count INTEGER NOT NULL
+)
+"""
+_SQL_CREATE_META = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+)
+"""
+_SQL_SELECT_SOURCE_ID = "SELECT id FROM sources WHERE name = ?"
+_SQL_INSERT_SOURCE = "INSERT OR IGNORE INTO sources (name) VALUES (?)"
+_SQL_SELECT_SENT = """
+SELECT 1 FROM sent_posts
+WHERE source_id = ? AND source_post_id = ?
+LIMIT 1
+"""
+_SQL_INSERT_SENT = """
+INSERT OR IGNORE INTO sent_posts (source_id, source_post_id, url, first_sent_at)
+VALUES (?, ?, ?, ?)
+"""
+_SQL_INSERT_LOG_RUN = """
+INSERT OR REPLACE INTO run_logs (run_at, new_count, error_count)
+VALUES (?, ?, ?)
+"""
+_SQL_SELECT_META = "SELECT value FROM meta WHERE key = ?"
+_SQL_UPSERT_META = """
+INSERT INTO meta (key, value)
+VALUES (?, ?)
+ON CONFLICT(key) DO UPDATE SET value = excluded.value
+"""
+_SQL_COUNT_SENT = "SELECT COUNT(*) FROM sent_posts"
+
+
+@cache
+def _sql_select_sent_keys(key_count: int) -> str:
+    values = ", ".join(["(?, ?)"] * key_count)
+    return f"""
+SELECT source_id, source_post_id FROM sent_posts
+WHERE (source_id, source_post_id) IN (VALUES {values})
+"""
+
+
+@cache
+def _sql_insert_sent_returning(row_count: int) -> str:
+    values = ", ".join(["(?, ?, ?, ?)"] * row_count)
+    return f"""
+INSERT OR IGNORE INTO sent_posts (source_id, source_post_id, url, first_sent_at)
+VALUES {values}
+RETURNING source_id, source_post_id
+"""
+
+
+@cache
+def _ensure_dir(path: Path) -> None:
+    # Stores are opened repeatedly against the same file; create its directory once per process.
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+class _Connection(Protocol):
+    """The slice of the DB-API both sqlite3 and apsw connections provide."""
+
+    def execute(self, sql: str, bindings: Any = ..., /) -> Any: ...
+
+    def executemany(self, sql: str, sequenceofbindings: Any, /) -> Any: ...
+
+    def close(self) -> None: ...
+
+
+def _connect(db_path: Path) -> _Connection:
+    """Open db_path with apsw when it is installed, else with the stdlib sqlite3 module."""
+    try:
+        import apsw
+    except ImportError:
+        # Autocommit mode: write batching is explicit through transaction(). Connections are
+        # per-thread, but close() may run on another thread.
+        conn = sqlite3.connect(
+            db_path,
+            isolation_level=None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+            check_same_thread=False,
+        )
+        conn.executescript(_CONNECTION_PRAGMAS)
+        return conn
+    # apsw is always in autocommit mode and has lower per-call overhead than sqlite3. It runs
+    # the later statements of a script only as earlier rows are consumed, so drain the pragmas.
+    conn = apsw.Connection(str(db_path), statementcachesize=_STATEMENT_CACHE_SIZE)
+    conn.execute(_CONNECTION_PRAGMAS).fetchall()
+    return conn
+
+
+def _chunks[T](items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class _ThreadState(threading.local):
+    conn: _Connection | None = None
+    in_transaction = False
+    # Keys written and source ids resolved by the open transaction; they enter the shared
+    # caches only once committed, since a rollback can hand the same source id to another name.
+    pending_sent: list[tuple[str, str]]
+    pending_source_ids: dict[str, int]
+
+    def __init__(self) -> None:
+        self.pending_sent = []
+        self.pending_source_ids = {}
+
 
 class StateStore(AbstractContextManager["StateStore"]):
+    """sqlite state shared by every thread of a run.
+
+    Each thread gets its own connection, so reads run in parallel under WAL; writers are
+    serialized by a lock held for the whole transaction.
+    """
+
     def __init__(self, db_path: Path | str):
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        _ensure_dir(self.db_path.parent)
+        self._local = _ThreadState()
+        self._connections: list[_Connection] = []
+        self._connections_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._sent_cache: OrderedDict[tuple[str, str], bool] = OrderedDict()
+        # Bumped on every commit, so a read that raced a commit does not cache a stale answer.
+        self._sent_cache_generation = 0
+        # Committed source name -> id mappings only; see _ThreadState.pending_source_ids.
+        self._source_ids: dict[str, int] = {}
         self._init_schema()
 
+    @property
+    def conn(self) -> _Connection:
+        """The calling thread's connection, opened on first use."""
+        conn = self._local.conn
+        if conn is None:
+            conn = self._local.conn = _connect(self.db_path)
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Commit every write made inside the block at once; nested blocks join the outer one."""
+        local = self._local
+        if local.in_transaction:
+            yield
+            return
+        conn = self.conn
+        with self._write_lock:
+            # Flag the thread only once BEGIN succeeded; a failed BEGIN (e.g. SQLITE_BUSY) must
+            # leave later transaction() calls starting their own transaction.
+            conn.execute("BEGIN IMMEDIATE")
+            local.in_transaction = True
+            try:
+                yield
+                conn.execute("COMMIT")
+            except BaseException:
+                # Also reached when COMMIT itself fails, which would otherwise leave the
+                # connection inside an open transaction. Some errors already rolled back, so a
+                # failing ROLLBACK must not mask the original exception.
+                with suppress(Exception):
+                    conn.execute("ROLLBACK")
+                raise
+            else:
+                self._source_ids.update(local.pending_source_ids)
+                with self._cache_lock:
+                    self._sent_cache_generation += 1
+                    for key in local.pending_sent:
+                        self._remember_sent(key, True)
+            finally:
+                local.in_transaction = False
+                local.pending_sent = []
+                local.pending_source_ids = {}
+
     def _init_schema(self) -> None:
-        with self.conn:
-            self.conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS sent_posts (
-                    source TEXT NOT NULL,
-                    source_post_id TEXT NOT NULL,
-                    url TEXT NOT NULL,
-                    first_sent_at TEXT NOT NULL,
-                    PRIMARY KEY (source, source_post_id)
-                )
-                """
-            )
-            self.conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS run_logs (
-                    run_at TEXT PRIMARY KEY,
-                    new_count INTEGER NOT NULL,
-                    error_count INTEGER NOT NULL
-                )
-                """
-            )
-            self.conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS meta (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL
-                )
-                """
-            )
+        with self.transaction():
+            self.conn.execute(_SQL_CREATE_SOURCES)
+            self._init_sent_posts()
+            self.conn.execute(_SQL_CREATE_RUN_LOGS)
+            self.conn.execute(_SQL_CREATE_META)
+
+    def _init_sent_posts(self) -> None:
+        row = self.conn.execute(_SQL_SELECT_SENT_POSTS_SCHEMA).fetchone()
+        if row is None:
+            self.conn.execute(_SENT_POSTS_DDL.format(table="sent_posts"))
+            return
+        if "source_id" in row[0]:
+            return
+        # Legacy table keyed by the source name: move the names into `sources` and rebuild the
+        # table as WITHOUT ROWID on source ids.
+        self.conn.execute(_SQL_MIGRATE_SOURCES)
+        self.conn.execute(_SENT_POSTS_DDL.format(table="sent_posts_v2"))
+        self.conn.execute(_SQL_MIGRATE_SENT_POSTS)
+        self.conn.execute("DROP TABLE sent_posts")
+        self.conn.execute("ALTER TABLE sent_posts_v2 RENAME TO sent_posts")
+
+    def _source_id(self, name: str) -> int | None:
+        source_id = self._source_ids.get(name)
+        if source_id is not None:
+            return source_id
+        local = self._local
+        source_id = local.pending_source_ids.get(name)
+        if source_id is not None:
+            return source_id
+        row = self.conn.execute(_SQL_SELECT_SOURCE_ID, (name,)).fetchone()
+        if row is None:
+            return None
+        source_id = int(row[0])
+        if local.in_transaction:
+            # Possibly inserted by this transaction; publish it once the transaction commits.
+            local.pending_source_ids[name] = source_id
+        else:
+            self._source_ids[name] = source_id
+        return source_id
+
+    def _ensure_source_id(self, name: str) -> int:
+        source_id = self._source_id(name)
+        if source_id is None:
+            self.conn.execute(_SQL_INSERT_SOURCE, (name,))
+            source_id = self._source_id(name)
+            assert source_id is not None
+        return source_id
 
     def mark_sent_if_new(self, post: JobPost, sent_at_utc: str | None = None) -> bool:
-        sent_at = sent_at_utc or datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-        with self.conn:
-            cursor = self.conn.execute(
-                """
-                INSERT OR IGNORE INTO sent_posts (source, source_post_id, url, first_sent_at)
-                VALUES (?, ?, ?, ?)
-                """,
-                (post.source, post.source_post_id, post.url, sent_at),
-            )
-        return cursor.rowcount == 1
+        return bool(self.filter_new_posts([post], sent_at_utc))
+
+    def _remember_sent(self, key: tuple[str, str], sent: bool) -> None:
+        # Callers hold _cache_lock.
+        self._sent_cache[key] = sent
+        self._sent_cache.move_to_end(key)
+        if len(self._sent_cache) > _SENT_CACHE_MAX_KEYS:
+            self._sent_cache.popitem(last=False)
 
     def is_sent(self, post: JobPost) -> bool:
-        row = self.conn.execute(
-            """
-            SELECT 1 FROM sent_posts
-            WHERE source = ? AND source_post_id = ?
-            LIMIT 1
-            """,
-            (post.source, post.source_post_id),
-        ).fetchone()
+        key = (post.source, post.source_post_id)
+        # Inside a transaction the answer may depend on uncommitted writes; skip the cache.
+        if self._local.in_transaction:
+            return self._query_sent(key)
+        with self._cache_lock:
+            sent = self._sent_cache.get(key)
+            if sent is not None:
+                self._sent_cache.move_to_end(key)
+                return sent
+            generation = self._sent_cache_generation
+        sent = self._query_sent(key)
+        with self._cache_lock:
+            if generation == self._sent_cache_generation:
+                self._remember_sent(key, sent)
+        return sent
+
+    def _query_sent(self, key: tuple[str, str]) -> bool:
+        source_id = self._source_id(key[0])
+        if source_id is None:
+            return False
+        row = self.conn.execute(_SQL_SELECT_SENT, (source_id, key[1])).fetchone()
         return row is not None
 
     def get_unsent_posts(self, posts: list[JobPost]) -> list[JobPost]:
-        unsent: list[JobPost] = []
-        seen_in_batch: set[tuple[str, str]] = set()
+        if not posts:
+            return []
+        unique_posts: dict[tuple[str, str], JobPost] = {}
         for post in posts:
-            key = (post.source, post.source_post_id)
-            if key in seen_in_batch:
-                continue
-            seen_in_batch.add(key)
-            if not self.is_sent(post):
-                unsent.append(post)
-        return unsent
+            unique_posts.setdefault((post.source, post.source_post_id), post)
+        # Posts from a source that has never been stored cannot have been sent.
+        id_keys: dict[tuple[int, str], tuple[str, str]] = {}
+        for source, source_post_id in unique_posts:
+            source_id = self._source_id(source)
+            if source_id is not None:
+                id_keys[(source_id, source_post_id)] = (source, source_post_id)
+        if not id_keys:
+            return list(unique_posts.values())
+        lookup_keys = list(id_keys)
+
+        sent: set[tuple[str, str]] = set()
+        for chunk in _chunks(lookup_keys, _MAX_LOOKUP_KEYS):
+            rows = self.conn.execute(
+                _sql_select_sent_keys(len(chunk)),
+                [value for key in chunk for value in key],
+            ).fetchall()
+            sent.update(id_keys[(row[0], row[1])] for row in rows)
+        return [post for key, post in unique_posts.items() if key not in sent]
 
     def mark_posts_sent(self, posts: list[JobPost], sent_at_utc: str | None = None) -> None:
-        sent_at = sent_at_utc or datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-        with self.conn:
-            self.conn.executemany(
-                """
-                INSERT OR IGNORE INTO sent_posts (source, source_post_id, url, first_sent_at)
-                VALUES (?, ?, ?, ?)
-                """,
-                [(post.source, post.source_post_id, post.url, sent_at) for post in posts],
-            )
+        if not posts:
+            return
+        sent_at = sent_at_utc or _utc_now_iso()
+        with self.transaction():
+            sources = {post.source for post in posts}
+            source_ids = {source: self._ensure_source_id(source) for source in sources}
+            for chunk in _chunks(posts, _MARK_SENT_CHUNK_ROWS):
+                self.conn.executemany(
+                    _SQL_INSERT_SENT,
+                    [
+                        (source_ids[post.source], post.source_post_id, post.url, sent_at)
+                        for post in chunk
+                    ],
+                )
+            self._local.pending_sent.extend((post.source, post.source_post_id) for post in posts)
 
-    def filter_new_posts(self, posts: list[JobPost], sent_at_utc: str | None = None) -> list[JobPost]:
-        new_posts: list[JobPost] = []
+    def insert_new_and_return(self, posts: list[JobPost], sent_at_utc: str) -> list[JobPost]:
+        """Record posts as sent in one pass and return only those that were newly inserted."""
+        unique_posts: dict[tuple[str, str], JobPost] = {}
         for post in posts:
-            if self.mark_sent_if_new(post, sent_at_utc=sent_at_utc):
-                new_posts.append(post)
-        return new_posts
+            unique_posts.setdefault((post.source, post.source_post_id), post)
+        if not unique_posts:
+            return []
+        batch = list(unique_posts.values())
+
+        inserted: set[tuple[int, str]] = set()
+        with self.transaction():
+            source_ids = {source: self._ensure_source_id(source) for source, _ in unique_posts}
+            # executemany() discards RETURNING rows, so insert multi-row VALUES chunks instead.
+            for chunk in _chunks(batch, _MAX_INSERT_ROWS):
+                params = [
+                    value
+                    for post in chunk
+                    for value in (
+                        source_ids[post.source],
+                        post.source_post_id,
+                        post.url,
+                        sent_at_utc,
+                    )
+                ]
+                rows = self.conn.execute(_sql_insert_sent_returning(len(chunk)), params).fetchall()
+                inserted.update((row[0], row[1]) for row in rows)
+            self._local.pending_sent.extend(unique_posts)
+        return [
+            post
+            for (source, source_post_id), post in unique_posts.items()
+            if (source_ids[source], source_post_id) in inserted
+        ]
+
+    def filter_new_posts(self, posts: list[JobPost], sent_at_utc: str | None = None) -> list[JobPost]:
+        """Mark posts as sent and return only those that were not recorded before."""
+        if not posts:
+            return []
+        return self.insert_new_and_return(posts, sent_at_utc or _utc_now_iso())
 
     def log_run(self, run_at_utc: str, new_count: int, error_count: int) -> None:
-        with self.conn:
-            self.conn.execute(
-                """
-                INSERT OR REPLACE INTO run_logs (run_at, new_count, error_count)
-                VALUES (?, ?, ?)
-                """,
-                (run_at_utc, new_count, error_count),
-            )
+        with self.transaction():
+            self.conn.execute(_SQL_INSERT_LOG_RUN, (run_at_utc, new_count, error_count))
 
     def get_meta(self, key: str) -> str | None:
-        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        row = self.conn.execute(_SQL_SELECT_META, (key,)).fetchone()
         if row is None:
             return None
-        return str(row["value"])
+        return str(row[0])
 
     def set_meta(self, key: str, value: str) -> None:
-        with self.conn:
-            self.conn.execute(
-                """
-                INSERT INTO meta (key, value)
-                VALUES (?, ?)
-                ON CONFLICT(key) DO UPDATE SET value = excluded.value
-                """,
-                (key, value),
-            )
+        with self.transaction():
+            self.conn.execute(_SQL_UPSERT_META, (key, value))
+
+    def set_meta_many(self, items: Iterable[tuple[str, str]]) -> None:
+        with self.transaction():
+            self.conn.executemany(_SQL_UPSERT_META, items)
 
     def count_sent_posts(self) -> int:
-        row = self.conn.execute("SELECT COUNT(*) AS c FROM sent_posts").fetchone()
-        return int(row["c"]) if row else 0
+        row = self.conn.execute(_SQL_COUNT_SENT).fetchone()
+        return int(row[0]) if row else 0
 
     def close(self) -> None:
-        self.conn.close()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
 
     def __exit__(self, exc_type, exc, exc_tb) -> None:
         self.close()
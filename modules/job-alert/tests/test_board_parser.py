@@ -0,0 +1,159 @@
+import httpx
+import pytest
+from lxml.html import HtmlElement
+
+from job_alert.config import Settings
+from job_alert.scrapers.common import (
+    compile_url_tokens,
+    fetch_document,
+    infer_post_id,
+    parse_board_posts,
+)
+from job_alert.scrapers.woorimel import BOARD_URLS, fetch_woorimel_posts
+
+BOARD_HTML = """
+<html><body>
+<div class="nav">
+  <a href="/bbs/login.php">로그인</a><a href="/bbs/board.php?bo_table=jobs&page=2">2</a>
+</div>
+<table>
+  <tr><td><a href="/bbs/board.php?bo_table=jobs&wr_id=101">건설 잡부 구합니다</a></td>
+      <td>멜번 시티 <b>데몰리션</b> 현장</td></tr>
+  <tr><td><a href="/bbs/board.php?bo_table=jobs&wr_id=102">타일 데모도</a></td></tr>
+  <tr><td><a href="/bbs/board.php?bo_table=jobs&wr_id=101">건설 잡부 구합니다</a></td></tr>
+  <tr><td><a href="https://other.example.com/article/5555">외부 링크 글</a></td></tr>
+</table>
+</body></html>
+"""
+
+
+def _parse(**kwargs):
+    return parse_board_posts(
+        BOARD_HTML,
+        base_url="https://board.example.com/bbs/board.php?bo_table=jobs",
+        source="example",
+        allow_url_tokens=("bo_table=jobs",),
+        **kwargs,
+    )
+
+
+def test_parse_board_posts_extracts_unique_posts_with_snippets() -> None:
+    posts = _parse()
+
+    assert [post.source_post_id for post in posts] == ["wr_id:101", "wr_id:102"]
+    assert posts[0].title == "건설 잡부 구합니다"
+    assert posts[0].url == "https://board.example.com/bbs/board.php?bo_table=jobs&wr_id=101"
+    assert posts[0].content_snippet == "건설 잡부 구합니다 멜번 시티 데몰리션 현장"
+    assert posts[1].content_snippet == ""
+    assert all(post.source == "example" for post in posts)
+
+
+def test_parse_board_posts_respects_limit() -> None:
+    assert len(_parse(limit=1)) == 1
+
+
+def test_parse_board_posts_accepts_precompiled_url_tokens() -> None:
+    posts = parse_board_posts(
+        BOARD_HTML,
+        base_url="https://board.example.com/bbs/board.php?bo_table=jobs",
+        source="example",
+        allow_url_tokens=compile_url_tokens(("wr_id=102", "article/")),
+    )
+
+    assert [post.source_post_id for post in posts] == ["wr_id:102", "path:5555"]
+
+
+def test_infer_post_id_falls_back_to_path_and_hash() -> None:
+    assert infer_post_id("https://example.com/article/5555") == "path:5555"
+    assert infer_post_id("https://example.com/about").startswith("hash:")
+
+
+def test_fetch_woorimel_posts_collects_every_board_page() -> None:
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        post_id = 900 + len(requested)
+        html = f'<ul><li><a href="/board/melbourne-jobs/post/{post_id}">건설 잡부</a></li></ul>'
+        return httpx.Response(200, text=html)
+
+    html_cache: dict[str, HtmlElement] = {}
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        result = fetch_woorimel_posts(Settings(), client=client, html_cache=html_cache)
+        retried = fetch_woorimel_posts(Settings(), client=client, html_cache=html_cache)
+
+    assert result.error is None
+    assert sorted(requested) == sorted(str(httpx.URL(url)) for url in BOARD_URLS)
+    assert sorted(post.source_post_id for post in result.posts) == ["path:901", "path:902"]
+    assert [post.url for post in retried.posts] == [post.url for post in result.posts]
+
+
+def test_fetch_document_retries_transient_errors_but_not_missing_pages() -> None:
+    statuses = {"https://example.com/flaky": [503, 200], "https://example.com/gone": [404, 200]}
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        requested.append(url)
+        return httpx.Response(statuses[url].pop(0), text="<p>ok</p>")
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        assert fetch_document(client, "https://example.com/flaky").text_content() == "ok"
+        with pytest.raises(httpx.HTTPStatusError):
+            fetch_document(client, "https://example.com/gone")
+
+    assert requested.count("https://example.com/flaky") == 2
+    assert requested.count("https://example.com/gone") == 1
+
+
+def test_fetch_document_streams_large_pages_into_the_board_parser() -> None:
+    rows = "".join(
+        f'<tr><td><a href="/bbs/board.php?wr_id={i}">건설 잡부 {i}</a></td><td>데몰리션</td></tr>'
+        for i in range(1, 2001)
+    )
+    body = f"<html><body><script>var x = 1;</script><table>{rows}</table></body></html>"
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content=body.encode("euc-kr"),
+            headers={"Content-Type": "text/html; charset=euc-kr"},
+        )
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        document = fetch_document(client, "https://example.com/bbs/board.php")
+
+    def parse(html: str | HtmlElement) -> list[tuple[str, str, str]]:
+        posts = parse_board_posts(
+            html,
+            base_url="https://example.com/bbs/board.php",
+            source="example",
+            allow_url_tokens=("wr_id=",),
+            limit=5000,
+        )
+        return [(post.source_post_id, post.title, post.content_snippet) for post in posts]
+
+    posts = parse(document)
+    assert posts == parse(body)
+    assert len(posts) == 2000
+    assert posts[0] == ("wr_id:1", "건설 잡부 1", "건설 잡부 1 데몰리션")
+
+
+@pytest.mark.parametrize(
+    ("charset", "encoding"),
+    [("ks_c_5601-1987", "cp949"), ("x-windows-949", "utf-8"), ("utf8mb4", "utf-8")],
+)
+def test_fetch_document_tolerates_aliased_and_unknown_charsets(charset, encoding) -> None:
+    body = '<ul><li><a href="/bbs/board.php?wr_id=1">건설 잡부</a></li></ul>'
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content=body.encode(encoding),
+            headers={"Content-Type": f"text/html; charset={charset}"},
+        )
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        document = fetch_document(client, "https://example.com/bbs/board.php")
+
+    assert document.text_content() == "건설 잡부"
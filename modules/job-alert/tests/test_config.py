@@ -1,4 +1,14 @@
-from job_alert.config import RUN_REQUIRED_ENVS, missing_envs
+import base64
+
+import pytest
+
+from job_alert.config import (
+    RUN_REQUIRED_ENVS,
+    Settings,
+    ensure_hojubada_storage_state,
+    load_settings,
+    missing_envs,
+)
 
 
 def test_storage_state_secret_is_optional() -> None:
@@ -16,3 +26,40 @@ def test_missing_envs_ignores_optional_storage_state() -> None:
         "HOJUBADA_PW": "f",
     }
     assert missing_envs(RUN_REQUIRED_ENVS, environ=env) == []
+
+
+def test_load_settings_reuses_settings_for_identical_env() -> None:
+    env = {"SLACK_WEBHOOK_URL": "https://hooks.slack.test/services/mock", "TZ": " UTC "}
+    first = load_settings(environ=env)
+    assert load_settings(environ=dict(env)) is first
+    assert first.tz == "UTC"
+    assert load_settings(environ={**env, "TZ": "Asia/Seoul"}).tz == "Asia/Seoul"
+
+
+def test_load_settings_rejects_insecure_webhook_and_invalid_retry_count() -> None:
+    with pytest.raises(ValueError, match="https://"):
+        load_settings(environ={"SLACK_WEBHOOK_URL": "http://hooks.slack.test/services/mock"})
+    with pytest.raises(ValueError, match="SITE_RETRY_ATTEMPTS"):
+        load_settings(environ={"SITE_RETRY_ATTEMPTS": "0"})
+
+
+def test_ensure_storage_state_decodes_large_b64_secret(tmp_path) -> None:
+    payload = b'{"cookies": []}' * 20_000
+    settings = Settings(
+        hojubada_storage_state_b64=base64.b64encode(payload).decode("ascii"),
+        hojubada_storage_path=tmp_path / "state" / "storage_state.json",
+    )
+
+    assert ensure_hojubada_storage_state(settings) == settings.hojubada_storage_path
+    assert settings.hojubada_storage_path.read_bytes() == payload
+
+
+def test_ensure_storage_state_keeps_existing_file_on_invalid_b64(tmp_path) -> None:
+    state_path = tmp_path / "storage_state.json"
+    state_path.write_bytes(b"previous")
+    settings = Settings(hojubada_storage_state_b64="not*base64!", hojubada_storage_path=state_path)
+
+    with pytest.raises(ValueError):
+        ensure_hojubada_storage_state(settings)
+    assert state_path.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [state_path]
@@ -1,6 +1,7 @@
 from job_alert.keywords import (
     build_blacklist_set,
     build_keyword_set,
+    compile_keyword_pattern,
     matches_blacklist,
     matches_keywords,
     normalize_text,
@@ -42,3 +43,22 @@ def test_blacklist_csv_override_adds_custom_terms() -> None:
     blacklist = build_blacklist_set("바리스타, cafe")
     assert "바리스타" in blacklist
     assert "cafe" in blacklist
+
+
+def test_compiled_keyword_pattern_matches_like_keyword_list() -> None:
+    keywords = build_keyword_set(None)
+    pattern = compile_keyword_pattern(keywords)
+    assert matches_keywords("멜번 건설 데몰리션 구인", "", pattern)
+    assert matches_keywords("Casual labour shift", "day job available", pattern)
+    assert not matches_keywords("카페 바리스타 구인", "", pattern)
+
+
+def test_empty_keyword_pattern_never_matches() -> None:
+    pattern = compile_keyword_pattern([])
+    assert not matches_keywords("건설 잡부", "construction", pattern)
+
+
+def test_keyword_set_orders_longer_phrases_first() -> None:
+    keywords = build_keyword_set(None)
+    assert keywords.index("단기알바") < keywords.index("단기")
+    assert [len(keyword) for keyword in keywords] == sorted(map(len, keywords), reverse=True)
@@ -1,8 +1,15 @@
+import sys
+import threading
+import types
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
 
+import pytest
+
 from job_alert.config import Settings
 from job_alert.models import JobPost, SiteResult
 from job_alert.pipeline import run_pipeline
+from job_alert.scrapers.browser import PlaywrightSession
 from job_alert.storage import StateStore
 
 
@@ -61,6 +68,32 @@ def test_pipeline_deduplicates_same_post_across_runs(tmp_path) -> None:
         assert store.count_sent_posts() == 1
 
 
+def test_pipeline_keeps_posts_unsent_when_slack_send_fails(tmp_path) -> None:
+    settings = _base_settings(tmp_path)
+    sent_messages: list[str] = []
+
+    def failing_sender(_: str, __: str, ___: float) -> None:
+        raise RuntimeError("slack down")
+
+    def fake_sender(_: str, message: str, __: float) -> None:
+        sent_messages.append(message)
+
+    def scraper(_: Settings) -> SiteResult:
+        return SiteResult(source="woorimel", posts=[_post("1")], error=None)
+
+    now = datetime(2026, 2, 19, 0, 0, tzinfo=timezone.utc)
+    with pytest.raises(RuntimeError):
+        run_pipeline(settings, scrapers=(scraper,), send_message=failing_sender, now_utc=now)
+
+    with StateStore(settings.sent_db_path) as store:
+        assert store.count_sent_posts() == 0
+
+    retried = run_pipeline(settings, scrapers=(scraper,), send_message=fake_sender, now_utc=now)
+
+    assert retried.new_count == 1
+    assert len(sent_messages) == 1
+
+
 def test_pipeline_reports_partial_failure_and_keeps_success(tmp_path) -> None:
     settings = _base_settings(tmp_path)
 
@@ -140,7 +173,7 @@ def test_pipeline_never_alerts_without_new_posts_even_after_failures(tmp_path) -
 
 def test_pipeline_retries_scraper_before_marking_failure(tmp_path) -> None:
     settings = _base_settings(tmp_path)
-    settings = settings.model_copy(update={"site_retry_attempts": 2, "site_retry_delay_seconds": 0.0})
+    settings = replace(settings, site_retry_attempts=2, site_retry_delay_seconds=0.0)
     sent_messages: list[str] = []
     attempts = {"count": 0}
 
@@ -202,3 +235,180 @@ def test_pipeline_excludes_blacklisted_posts(tmp_path) -> None:
     assert result.new_count == 1
     assert result.message_sent
     assert "키친핸드" not in sent_messages[0]
+
+
+def test_pipeline_runs_scrapers_concurrently_and_keeps_order(tmp_path) -> None:
+    settings = _base_settings(tmp_path)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_sender(_: str, __: str, ___: float) -> None:
+        return None
+
+    def first_scraper(_: Settings) -> SiteResult:
+        barrier.wait()
+        return SiteResult(source="woorimel", posts=[], error="first")
+
+    def second_scraper(_: Settings) -> SiteResult:
+        barrier.wait()
+        return SiteResult(source="melbsky", posts=[], error="second")
+
+    result = run_pipeline(
+        replace(settings, site_retry_attempts=1),
+        scrapers=(first_scraper, second_scraper),
+        send_message=fake_sender,
+        now_utc=datetime(2026, 2, 19, 3, 0, tzinfo=timezone.utc),
+    )
+
+    assert result.error_messages == ["woorimel: first", "melbsky: second"]
+
+
+def test_pipeline_shares_one_browser_session_across_retries(tmp_path) -> None:
+    settings = replace(
+        _base_settings(tmp_path), site_retry_attempts=3, site_retry_delay_seconds=0.0
+    )
+    sessions: list[PlaywrightSession] = []
+
+    def fake_sender(_: str, __: str, ___: float) -> None:
+        return None
+
+    def browser_scraper(_: Settings, *, browser_session: PlaywrightSession) -> SiteResult:
+        sessions.append(browser_session)
+        return SiteResult(source="hojubada", posts=[], error="login page changed")
+
+    result = run_pipeline(
+        settings,
+        scrapers=(browser_scraper,),
+        send_message=fake_sender,
+        now_utc=datetime(2026, 2, 19, 4, 0, tzinfo=timezone.utc),
+    )
+
+    assert result.error_messages == ["hojubada: login page changed"]
+    assert len(sessions) == 3
+    assert all(session is sessions[0] for session in sessions)
+
+
+def test_playwright_session_stops_the_driver_when_launch_fails(monkeypatch) -> None:
+    drivers: list[dict[str, bool]] = []
+
+    class FakeChromium:
+        def __init__(self, driver: dict[str, bool]) -> None:
+            self.driver = driver
+
+        def launch(self, *, headless: bool) -> object:
+            if len(drivers) < 3:
+                raise RuntimeError("browser binary missing")
+            return types.SimpleNamespace(close=lambda: None, is_connected=lambda: True)
+
+    class FakeDriver:
+        def start(self) -> types.SimpleNamespace:
+            driver = {"stopped": False}
+            drivers.append(driver)
+            return types.SimpleNamespace(
+                chromium=FakeChromium(driver), stop=lambda: driver.update(stopped=True)
+            )
+
+    fake_module = types.ModuleType("playwright.sync_api")
+    fake_module.sync_playwright = FakeDriver
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", fake_module)
+
+    session = PlaywrightSession()
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            _ = session.browser
+    assert [driver["stopped"] for driver in drivers] == [True, True]
+
+    assert session.browser is not None
+    session.close()
+    assert [driver["stopped"] for driver in drivers] == [True, True, True]
+
+
+def test_playwright_session_relaunches_a_disconnected_browser(monkeypatch) -> None:
+    launched: list[dict[str, bool]] = []
+    stopped: list[bool] = []
+
+    class FakeChromium:
+        def launch(self, *, headless: bool) -> types.SimpleNamespace:
+            state = {"connected": True, "closed": False}
+            launched.append(state)
+            return types.SimpleNamespace(
+                is_connected=lambda: state["connected"],
+                close=lambda: state.update(closed=True),
+            )
+
+    class FakeDriver:
+        def start(self) -> types.SimpleNamespace:
+            return types.SimpleNamespace(chromium=FakeChromium(), stop=lambda: stopped.append(True))
+
+    fake_module = types.ModuleType("playwright.sync_api")
+    fake_module.sync_playwright = FakeDriver
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", fake_module)
+
+    with PlaywrightSession() as session:
+        first = session.browser
+        assert session.browser is first
+        assert len(launched) == 1
+
+        launched[0]["connected"] = False
+        second = session.browser
+
+        assert second is not first
+        assert len(launched) == 2
+        assert launched[0]["closed"]
+        assert stopped == [True]
+
+    assert stopped == [True, True]
+
+
+def test_pipeline_does_not_retry_non_retryable_failures(tmp_path) -> None:
+    settings = replace(
+        _base_settings(tmp_path), site_retry_attempts=3, site_retry_delay_seconds=0.0
+    )
+    attempts = {"count": 0}
+
+    def fake_sender(_: str, __: str, ___: float) -> None:
+        return None
+
+    def auth_failing_scraper(_: Settings) -> SiteResult:
+        attempts["count"] += 1
+        return SiteResult(
+            source="hojubada", posts=[], error="kakao id input not found", retryable=False
+        )
+
+    result = run_pipeline(
+        settings,
+        scrapers=(auth_failing_scraper,),
+        send_message=fake_sender,
+        now_utc=datetime(2026, 2, 19, 5, 0, tzinfo=timezone.utc),
+    )
+
+    assert attempts["count"] == 1
+    assert result.error_messages == ["hojubada: kakao id input not found"]
+
+
+def test_pipeline_shares_one_http_client_between_scrapers(tmp_path) -> None:
+    settings = _base_settings(tmp_path)
+    clients: list[object] = []
+
+    def fake_sender(_: str, __: str, ___: float) -> None:
+        return None
+
+    def first_scraper(_: Settings, *, client) -> SiteResult:
+        clients.append(client)
+        return SiteResult(source="woorimel", posts=[], error=None)
+
+    def second_scraper(_: Settings, *, client) -> SiteResult:
+        clients.append(client)
+        return SiteResult(source="melbsky", posts=[], error=None)
+
+    run_pipeline(
+        settings,
+        scrapers=(first_scraper, second_scraper),
+        send_message=fake_sender,
+        now_utc=datetime(2026, 2, 19, 6, 0, tzinfo=timezone.utc),
+    )
+
+    assert len(clients) == 2
+    assert clients[0] is clients[1]
+    assert clients[0].is_closed
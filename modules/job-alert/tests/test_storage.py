@@ -1,5 +1,12 @@
+import sqlite3
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime, timezone
 
+import pytest
+
 from job_alert.models import JobPost
 from job_alert.storage import StateStore
 
@@ -39,3 +46,236 @@ def test_get_unsent_posts_and_mark_posts_sent(tmp_path) -> None:
 
         second_unsent = store.get_unsent_posts(posts)
         assert second_unsent == []
+
+
+def test_transaction_commits_once_and_rolls_back_on_error(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+
+    with StateStore(db_path) as store:
+        with store.transaction():
+            store.mark_posts_sent([_sample_post("1")])
+            store.set_meta_many([("a", "1"), ("b", "2")])
+        assert store.get_meta("b") == "2"
+
+        try:
+            with store.transaction():
+                store.mark_posts_sent([_sample_post("2")])
+                store.set_meta("a", "changed")
+                raise RuntimeError("slack down")
+        except RuntimeError:
+            pass
+
+        assert store.count_sent_posts() == 1
+        assert store.get_meta("a") == "1"
+
+
+def test_source_ids_from_an_open_transaction_stay_private_until_commit(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+    rolled_back = replace(_sample_post("1"), source="hojubada")
+    reused_id = replace(_sample_post("1"), source="melbsky")
+
+    with StateStore(db_path) as store:
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.mark_posts_sent([rolled_back])
+                assert "hojubada" not in store._source_ids
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    assert not executor.submit(store.is_sent, rolled_back).result()
+                raise RuntimeError("boom")
+
+        # The rolled-back id is handed to the next source; the old name must not match it.
+        store.mark_posts_sent([reused_id])
+        assert store.is_sent(reused_id)
+        assert not store.is_sent(rolled_back)
+        assert store.get_unsent_posts([rolled_back]) == [rolled_back]
+
+
+def test_empty_batches_return_without_writing(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+
+    with StateStore(db_path) as store:
+        assert store.get_unsent_posts([]) == []
+        assert store.filter_new_posts([]) == []
+        assert store.insert_new_and_return([], "2026-02-19T00:00:00+00:00") == []
+        store.mark_posts_sent([])
+        assert store.count_sent_posts() == 0
+        assert store.conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0] == 0
+
+
+def test_transaction_recovers_after_begin_fails_on_a_locked_database(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+    locker_script = (
+        "import sqlite3, sys\n"
+        "conn = sqlite3.connect(sys.argv[1], isolation_level=None)\n"
+        "conn.execute('BEGIN IMMEDIATE')\n"
+        "print('locked', flush=True)\n"
+        "sys.stdin.readline()\n"
+    )
+
+    with StateStore(db_path) as store:
+        store.conn.execute("PRAGMA busy_timeout = 0").fetchall()
+        locker = subprocess.Popen(
+            [sys.executable, "-c", locker_script, str(db_path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            assert locker.stdout.readline().strip() == "locked"
+            with pytest.raises(Exception, match="locked"):
+                store.mark_posts_sent([_sample_post("1")])
+        finally:
+            locker.communicate("\n", timeout=10)
+
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.mark_posts_sent([_sample_post("2")])
+                raise RuntimeError("boom")
+
+        assert store.count_sent_posts() == 0
+        store.mark_posts_sent([_sample_post("3")])
+        assert store.count_sent_posts() == 1
+
+
+def test_filter_new_posts_returns_only_first_seen_posts(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+    posts = [_sample_post(str(post_id)) for post_id in range(450)]
+
+    with StateStore(db_path) as store:
+        assert store.mark_sent_if_new(posts[10])
+        new_posts = store.filter_new_posts(posts + [_sample_post("0")])
+
+        assert [post.source_post_id for post in new_posts] == [
+            str(post_id) for post_id in range(450) if post_id != 10
+        ]
+        assert store.count_sent_posts() == 450
+        assert store.filter_new_posts(posts) == []
+
+
+def test_is_sent_cache_follows_writes_and_rollbacks(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+    post = _sample_post("7")
+
+    with StateStore(db_path) as store:
+        assert not store.is_sent(post)
+
+        try:
+            with store.transaction():
+                store.mark_posts_sent([post])
+                assert store.is_sent(post)
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+        assert not store.is_sent(post)
+        store.mark_posts_sent([post])
+        assert store.is_sent(post)
+
+
+def test_get_unsent_posts_handles_batches_larger_than_one_query(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+    posts = [_sample_post(str(post_id)) for post_id in range(1000)]
+
+    with StateStore(db_path) as store:
+        store.mark_posts_sent(posts[::2])
+        unsent = store.get_unsent_posts(posts + posts[:5])
+
+        assert [post.source_post_id for post in unsent] == [str(i) for i in range(1, 1000, 2)]
+
+
+def test_state_store_uses_wal_and_leaves_no_wal_file_after_close(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+
+    with StateStore(db_path) as store:
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        store.mark_posts_sent([_sample_post("1")])
+
+    assert not (tmp_path / "state.sqlite-wal").exists()
+    with StateStore(db_path) as store:
+        assert store.count_sent_posts() == 1
+
+
+def test_state_store_gives_each_thread_its_own_connection(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+    posts = [_sample_post(str(post_id)) for post_id in range(20)]
+
+    with StateStore(db_path) as store:
+        store.mark_posts_sent(posts[::2])
+
+        def check(post: JobPost) -> tuple[int, bool]:
+            return id(store.conn), store.is_sent(post)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(check, posts))
+            written = list(executor.map(store.filter_new_posts, [[post] for post in posts]))
+
+        assert [sent for _, sent in results] == [post_id % 2 == 0 for post_id in range(20)]
+        assert len({conn_id for conn_id, _ in results} | {id(store.conn)}) > 1
+        assert sum(len(new_posts) for new_posts in written) == 10
+        assert store.count_sent_posts() == 20
+
+    assert not (tmp_path / "state.sqlite-wal").exists()
+
+
+@pytest.mark.parametrize("table_options", ["", "WITHOUT ROWID"])
+def test_legacy_sent_posts_table_is_migrated_to_source_ids(tmp_path, table_options) -> None:
+    db_path = tmp_path / "state.sqlite"
+    legacy = sqlite3.connect(db_path)
+    legacy.execute(
+        f"""
+        CREATE TABLE sent_posts (
+            source TEXT NOT NULL,
+            source_post_id TEXT NOT NULL,
+            url TEXT NOT NULL,
+            first_sent_at TEXT NOT NULL,
+            PRIMARY KEY (source, source_post_id)
+        ) {table_options}
+        """
+    )
+    legacy.executemany(
+        "INSERT INTO sent_posts VALUES (?, ?, ?, 'x')",
+        [
+            ("woorimel", "1", "https://example.com/post/1"),
+            ("melbsky", "1", "https://example.com/melbsky/1"),
+        ],
+    )
+    legacy.commit()
+    legacy.close()
+
+    with StateStore(db_path) as store:
+        (table_sql,) = store.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'sent_posts'"
+        ).fetchone()
+        assert "WITHOUT ROWID" in table_sql
+        assert "source_id" in table_sql
+        assert store.count_sent_posts() == 2
+        assert store.is_sent(_sample_post("1"))
+        unsent = store.get_unsent_posts([_sample_post("1"), _sample_post("2")])
+        assert [post.source_post_id for post in unsent] == ["2"]
+
+
+def test_state_store_falls_back_to_stdlib_sqlite3_without_apsw(tmp_path, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "apsw", None)
+    db_path = tmp_path / "state.sqlite"
+
+    with StateStore(db_path) as store:
+        assert isinstance(store.conn, sqlite3.Connection)
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert store.filter_new_posts([_sample_post("1"), _sample_post("2")])
+        assert store.is_sent(_sample_post("1"))
+        assert store.count_sent_posts() == 2
+
+
+def test_posts_from_an_unseen_source_are_unsent(tmp_path) -> None:
+    db_path = tmp_path / "state.sqlite"
+    other = replace(_sample_post("1"), source="hojubada")
+
+    with StateStore(db_path) as store:
+        store.mark_posts_sent([_sample_post("1")])
+
+        assert not store.is_sent(other)
+        assert store.get_unsent_posts([other, _sample_post("1")]) == [other]
+        assert store.filter_new_posts([other]) == [other]
+        assert store.is_sent(other)
+        (source_count,) = store.conn.execute("SELECT COUNT(*) FROM sources").fetchone()
+        assert source_count == 2